@@ -1,24 +1,393 @@
 #!/usr/bin/env python
 
 import argparse
-import configparser
-import datetime
+import asyncio
+import functools
 import json
-import sys
+import logging
+import os
+import random
+import re
 import time
-import uuid
-import boto3
+import orjson
+import requests
+from dataclasses import dataclass
 from decimal import Decimal
+from typing import Optional
 from coinbase.rest import RESTClient
-from json import dumps
 
 
-def get_timestamp():
-    ts = time.time()
-    return datetime.datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+# Lambda's runtime already attaches a handler that timestamps each line
+logger = logging.getLogger()
+logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+
+def _dump(d):
+    # SNS message bodies; orjson is much faster than json.dumps(sort_keys=True)
+    return orjson.dumps(d, option=orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2).decode()
+
 
 def generate_client_order_id():
-    return str(uuid.uuid4())
+    # client_order_id is an opaque string, no need for a formatted UUID
+    return os.urandom(16).hex()
+
+
+# Clients are kept at module scope so warm Lambda invocations reuse them
+_SNS = None
+_REST = None
+_REST_CREDENTIALS = None
+
+
+def _get_sns():
+    global _SNS
+    if _SNS is None:
+        # boto3 loads its service models on import, so only pay for that
+        # once a notification client is actually needed
+        import boto3
+        from botocore.config import Config
+
+        _SNS = boto3.client(
+            'sns',
+            config=Config(
+                retries={'max_attempts': 2, 'mode': 'standard'},
+                connect_timeout=2,
+                read_timeout=5,
+            ),
+        )
+    return _SNS
+
+
+def _get_rest(key, secret):
+    global _REST, _REST_CREDENTIALS
+    if _REST is None or _REST_CREDENTIALS != (key, secret):
+        _REST = RESTClient(api_key=key, api_secret=secret, timeout=5)
+        _REST_CREDENTIALS = (key, secret)
+    return _REST
+
+
+# SNS notifications queued during a run, sent together by flush_notifications()
+_pending_sns = []
+
+
+def queue_notification(subject, message):
+    _pending_sns.append({
+        'Id': str(len(_pending_sns)),
+        'Subject': subject,
+        'Message': message,
+    })
+
+
+def flush_notifications(sns, sns_topic):
+    # publish_batch accepts at most 10 entries per call
+    failures = []
+    while _pending_sns:
+        entries = _pending_sns[:10]
+        del _pending_sns[:10]
+        response = sns.publish_batch(
+            TopicArn=sns_topic,
+            PublishBatchRequestEntries=entries
+        )
+        for failed in response.get('Failed', []):
+            logger.error(
+                "SNS publish failed for entry %s: %s", failed['Id'], failed.get('Message')
+            )
+            failures.append(failed)
+
+    # publish() used to raise on failure; don't let a lost alert pass silently
+    if failures:
+        raise Exception(f"{len(failures)} SNS notification(s) failed to publish")
+
+
+PENDING_STATUSES = ['OPEN', 'PENDING', 'UNKNOWN_ORDER_STATUS']
+FILLED_STATUSES = ['FILLED', 'DONE']
+
+
+def is_cancelled(order):
+    return bool(order["cancel_message"] or order["reject_message"]) and \
+        order["status"] not in ['OPEN', 'FILLED', 'UNKNOWN_ORDER_STATUS']
+
+
+RETRYABLE_STATUS_CODES = [429, 500, 502, 503, 504]
+MAX_RETRY_BACKOFF = 8
+
+
+async def _get_order_retrying(client, order_id, attempts=4):
+    """
+        get_order with jittered exponential backoff on rate limits, 5xx and
+        connection errors. Honors the Retry-After header when present, capped
+        at MAX_RETRY_BACKOFF. Returns (response, secs spent sleeping).
+    """
+    slept = 0
+    for attempt in range(attempts):
+        try:
+            return await asyncio.to_thread(client.get_order, order_id), slept
+        except (requests.exceptions.HTTPError,
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout) as e:
+            response = getattr(e, "response", None)
+            if response is not None and \
+                    response.status_code not in RETRYABLE_STATUS_CODES:
+                raise
+            if attempt == attempts - 1:
+                raise
+
+            retry_after = None
+            if response is not None:
+                retry_after = response.headers.get("Retry-After")
+            try:
+                backoff = min(max(float(retry_after), 0), MAX_RETRY_BACKOFF)
+            except (TypeError, ValueError):
+                backoff = min(2 ** attempt + random.random(), MAX_RETRY_BACKOFF)
+
+            logger.warning(
+                "get_order %s failed (%s), retrying in %.1f secs", order_id, e, backoff
+            )
+            await asyncio.sleep(backoff)
+            slept += backoff
+
+
+async def poll_order(client, order_id, initial_poll, max_poll, warn_after):
+    """
+        Poll an order until it leaves a pending status, is cancelled/rejected or
+        warn_after secs have passed. Returns the last order seen.
+    """
+    wait_time = initial_poll
+
+    # Retry sleeps count toward warn_after too
+    order_response, total_wait_time = await _get_order_retrying(client, order_id)
+    logger.debug("Response: %s", order_response)
+
+    order = order_response.order
+    logger.info("Order: %s", order)
+    logger.info("Status: %s", order['status'])
+
+    while order['status'] in PENDING_STATUSES and not is_cancelled(order):
+        if total_wait_time >= warn_after:
+            break
+
+        # Don't let the backoff overshoot warn_after
+        wait_time = min(wait_time, warn_after - total_wait_time)
+
+        logger.info(
+            "Order %s still %s. Sleeping for %s (total %s)",
+            order_id, order['status'], wait_time, total_wait_time
+        )
+        await asyncio.sleep(wait_time)
+        total_wait_time += wait_time
+        wait_time = min(wait_time * 2, max_poll)
+        order_response, slept = await _get_order_retrying(client, order_id)
+        total_wait_time += slept
+        order = order_response.order
+
+    return order
+
+
+async def wait_for_orders(client, order_ids, initial_poll, max_poll, warn_after):
+    """
+        Poll several orders concurrently so the total wait is that of the
+        slowest order rather than the sum of all of them.
+    """
+    tasks = {
+        asyncio.create_task(
+            poll_order(client, order_id, initial_poll, max_poll, warn_after),
+            name=order_id,
+        )
+        for order_id in order_ids
+    }
+    orders = {}
+    while tasks:
+        done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            orders[task.get_name()] = task.result()
+    return orders
+
+
+def _unescape_config_value(config_file, key, value):
+    # configparser's BasicInterpolation: "%%" is a literal "%", anything else
+    # after a "%" is interpolation, which these settings never need
+    if "%" in value.replace("%%", ""):
+        raise Exception(
+            f"{config_file}: unsupported '%' interpolation in {key}, use '%%'"
+        )
+    return value.replace("%%", "%")
+
+
+@functools.lru_cache(maxsize=None)
+def read_config(config_file):
+    """
+        Minimal parser for the settings file: `[section]` headers followed by
+        `KEY = value` (or `KEY: value`) lines, with indented lines continuing
+        the previous value. Keys under `[DEFAULT]` are inherited by every
+        section. Returns {section: {KEY: value}}.
+    """
+    # Cached per config file so warm Lambda invocations skip the disk read
+    config = {}
+    section = None
+    key = None
+    with open(config_file) as f:
+        for line_number, raw_line in enumerate(f, 1):
+            line = raw_line.strip()
+            if not line or line[0] in "#;":
+                continue
+            header = re.match(r"\[(.+)\]", line)
+            if raw_line[0].isspace() and key is not None:
+                # Indented continuation line, e.g. a multi-line PEM secret
+                section[key] += "\n" + line
+            elif header:
+                if header.group(1) in config:
+                    raise Exception(
+                        f"{config_file}:{line_number}: "
+                        f"section {header.group(1)!r} already exists"
+                    )
+                section = config[header.group(1)] = {}
+                key = None
+            else:
+                delimiters = [i for i in (line.find("="), line.find(":")) if i > 0]
+                if section is None or not delimiters:
+                    raise Exception(
+                        f"{config_file}:{line_number}: cannot parse line {line!r}"
+                    )
+                key = line[:min(delimiters)].strip().upper()
+                if key in section:
+                    raise Exception(
+                        f"{config_file}:{line_number}: option {key!r} already exists"
+                    )
+                section[key] = line[min(delimiters) + 1:].strip()
+
+    defaults = config.pop("DEFAULT", {})
+    return {
+        name: {
+            key: _unescape_config_value(config_file, key, value)
+            for key, value in {**defaults, **values}.items()
+        }
+        for name, values in config.items()
+    }
+
+
+def get_config_value(config_file, section, key):
+    config = read_config(config_file)
+    if section not in config:
+        raise Exception(f"{config_file}: no section {section!r}")
+    if key not in config[section]:
+        raise Exception(f"{config_file}: no option {key!r} in section {section!r}")
+    return config[section][key]
+
+
+SSM_PARAMETER_NAMES = ["api_key", "secret_key", "sns_topic"]
+_SSM_CREDENTIALS = {}
+
+
+def _get_extension_parameter(name):
+    # AWS Parameters and Secrets Lambda Extension, cached for the container life
+    port = os.environ.get("PARAMETERS_SECRETS_EXTENSION_HTTP_PORT", "2773")
+    response = requests.get(
+        f"http://localhost:{port}/systemsmanager/parameters/get",
+        params={"name": name, "withDecryption": "true"},
+        headers={
+            "X-Aws-Parameters-Secrets-Token": os.environ["AWS_SESSION_TOKEN"]
+        },
+        timeout=2,
+    )
+    response.raise_for_status()
+    return response.json()["Parameter"]["Value"]
+
+
+def get_ssm_credentials(prefix):
+    """
+        Fetch (api_key, secret_key, sns_topic) from SSM Parameter Store under
+        `prefix`, once per container. Uses the Lambda extension when it's
+        available, otherwise a single batched get_parameters call.
+    """
+    if prefix not in _SSM_CREDENTIALS:
+        names = [f"{prefix.rstrip('/')}/{name}" for name in SSM_PARAMETER_NAMES]
+        try:
+            values = [_get_extension_parameter(name) for name in names]
+        except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+            logger.info(
+                "Parameters extension unavailable (%s), calling SSM directly", e
+            )
+            import boto3
+
+            response = boto3.client("ssm").get_parameters(
+                Names=names, WithDecryption=True
+            )
+            if response["InvalidParameters"]:
+                raise Exception(
+                    f"SSM parameters not found: {response['InvalidParameters']}"
+                )
+            found = {param["Name"]: param["Value"] for param in response["Parameters"]}
+            values = [found[name] for name in names]
+        _SSM_CREDENTIALS[prefix] = tuple(values)
+    return _SSM_CREDENTIALS[prefix]
+
+
+async def _bootstrap(config_file, market_name):
+    """
+        Read the credentials (from SSM when SSM_PARAMETER_PREFIX is set, else
+        the config file, concurrently with creating the SNS client), then chain
+        the REST client and product lookup, which both need the credentials.
+    """
+    ssm_prefix = os.environ.get("SSM_PARAMETER_PREFIX")
+    if ssm_prefix:
+        # Not gathered with _get_sns: the get_parameters fallback would create
+        # a second boto3 client on the shared default session concurrently,
+        # which isn't thread-safe
+        logger.info("Reading credentials from SSM: %s", ssm_prefix)
+        key, secret, sns_topic = await asyncio.to_thread(get_ssm_credentials, ssm_prefix)
+        sns = await asyncio.to_thread(_get_sns)
+    else:
+        logger.info("Reading config file: %s", config_file)
+        config, sns = await asyncio.gather(
+            asyncio.to_thread(read_config, config_file),
+            asyncio.to_thread(_get_sns),
+        )
+        config_section = "production"
+
+        key = get_config_value(config_file, config_section, "API_KEY")
+        secret = get_config_value(config_file, config_section, "SECRET_KEY")
+        sns_topic = get_config_value(config_file, config_section, "SNS_TOPIC")
+
+    client = await asyncio.to_thread(_get_rest, key, secret)
+    product = await asyncio.to_thread(get_cached_product, client, market_name)
+    return sns, sns_topic, client, product
+
+
+def _fetch_product(client, market_name):
+    product = client.get_product(market_name)
+    return {
+        "base_currency_id": product.base_currency_id,
+        "quote_currency_id": product.quote_currency_id,
+        "base_increment": product.base_increment,
+        "quote_increment": product.quote_increment,
+        "base_min_size": product.base_min_size,
+    }
+
+
+def get_cached_product(client, market_name, ttl=3600):
+    # Product metadata rarely changes; cache it in /tmp, which survives
+    # across warm invocations of the same Lambda container. Only done inside
+    # Lambda: on a shared host /tmp is writable by other users, who could
+    # plant the increments that size the order.
+    if not os.environ.get("AWS_LAMBDA_FUNCTION_NAME") or \
+            os.sep in market_name or (os.altsep and os.altsep in market_name):
+        return _fetch_product(client, market_name)
+
+    cache_file = f"/tmp/product_{market_name}.json"
+    try:
+        if time.time() - os.path.getmtime(cache_file) < ttl:
+            with open(cache_file) as f:
+                return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    product_details = _fetch_product(client, market_name)
+    try:
+        with open(cache_file, "w") as f:
+            json.dump(product_details, f)
+    except OSError:
+        pass
+    return product_details
+
 
 """
     Basic Coinbase Pro DCA buy/sell bot that executes a market order.
@@ -33,76 +402,129 @@ def generate_client_order_id():
     This is meant to be run as a crontab to make regular buys/sells on a set schedule.
 """
 
-parser = argparse.ArgumentParser(
-    description="""
-        This is a basic Coinbase Pro DCA buying/selling bot.
-
-        ex:
-            BTC-USD BUY 14 USD          (buy $14 worth of BTC)
-            BTC-USD BUY 0.00125 BTC     (buy 0.00125 BTC)
-            ETH-BTC SELL 0.00125 BTC    (sell 0.00125 BTC worth of ETH)
-            ETH-BTC SELL 0.1 ETH        (sell 0.1 ETH)
-    """,
-    formatter_class=argparse.RawTextHelpFormatter,
-)
-
-# Required positional arguments
-parser.add_argument(
-    "-market_name", default="BTC-USD", help="(e.g. BTC-USD, ETH-BTC, etc)"
-)
-
-parser.add_argument("-order_side", default="BUY", type=str, choices=["BUY", "SELL"])
-
-parser.add_argument(
-    "-amount",
-    type=Decimal,
-    default="4.00",
-    help="The quantity to buy or sell in the amount_currency",
-)
-
-parser.add_argument(
-    "-amount_currency", default="USD", help="The currency the amount is denominated in"
-)
-
-
-# Additional options
-parser.add_argument(
-    "-sandbox",
-    action="store_true",
-    default=False,
-    dest="sandbox_mode",
-    help="Run against sandbox, skips user confirmation prompt",
-)
-
-parser.add_argument(
-    "-warn_after",
-    default=30,
-    action="store",
-    type=int,
-    dest="warn_after",
-    help="secs to wait before sending an alert that an order isn't done",
-)
-
-parser.add_argument(
-    "-j",
-    "--job",
-    action="store_true",
-    default=False,
-    dest="job_mode",
-    help="Suppresses user confirmation prompt",
-)
-
-parser.add_argument(
-    "-c",
-    "--config",
-    default="./settings-local.conf",
-    dest="config_file",
-    help="Override default config file location",
-)
+
+@dataclass
+class Args:
+    """
+        Bot settings. Populated straight from the event attributes when running
+        in Lambda, and used as the argparse defaults when running from the CLI.
+    """
+    market_name: str = "BTC-USD"
+    order_side: str = "BUY"
+    amount: Decimal = Decimal("4.00")
+    amount_currency: str = "USD"
+    sandbox_mode: bool = False
+    warn_after: int = 30
+    initial_poll: float = 1.0
+    max_poll: Optional[float] = None
+    job_mode: bool = False
+    config_file: str = "./settings-local.conf"
+
+
+def positive_float(value):
+    value = float(value)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"{value} must be greater than 0")
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def get_parser():
+    parser = argparse.ArgumentParser(
+        description="""
+            This is a basic Coinbase Pro DCA buying/selling bot.
+
+            ex:
+                BTC-USD BUY 14 USD          (buy $14 worth of BTC)
+                BTC-USD BUY 0.00125 BTC     (buy 0.00125 BTC)
+                ETH-BTC SELL 0.00125 BTC    (sell 0.00125 BTC worth of ETH)
+                ETH-BTC SELL 0.1 ETH        (sell 0.1 ETH)
+        """,
+        formatter_class=argparse.RawTextHelpFormatter,
+    )
+
+    # Required positional arguments
+    parser.add_argument(
+        "-market_name", default=Args.market_name, help="(e.g. BTC-USD, ETH-BTC, etc)"
+    )
+
+    parser.add_argument(
+        "-order_side", default=Args.order_side, type=str, choices=["BUY", "SELL"]
+    )
+
+    parser.add_argument(
+        "-amount",
+        type=Decimal,
+        default=Args.amount,
+        help="The quantity to buy or sell in the amount_currency",
+    )
+
+    parser.add_argument(
+        "-amount_currency",
+        default=Args.amount_currency,
+        help="The currency the amount is denominated in",
+    )
+
+
+    # Additional options
+    parser.add_argument(
+        "-sandbox",
+        action="store_true",
+        default=Args.sandbox_mode,
+        dest="sandbox_mode",
+        help="Run against sandbox, skips user confirmation prompt",
+    )
+
+    parser.add_argument(
+        "-warn_after",
+        default=Args.warn_after,
+        action="store",
+        type=int,
+        dest="warn_after",
+        help="secs to wait before sending an alert that an order isn't done",
+    )
+
+    parser.add_argument(
+        "-initial_poll",
+        default=Args.initial_poll,
+        action="store",
+        type=positive_float,
+        dest="initial_poll",
+        help="secs to wait before the first order status re-check (doubles each poll)",
+    )
+
+    parser.add_argument(
+        "-max_poll",
+        default=Args.max_poll,
+        action="store",
+        type=positive_float,
+        dest="max_poll",
+        help="max secs between order status checks (defaults to warn_after / 2)",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--job",
+        action="store_true",
+        default=Args.job_mode,
+        dest="job_mode",
+        help="Suppresses user confirmation prompt",
+    )
+
+    parser.add_argument(
+        "-c",
+        "--config",
+        default=Args.config_file,
+        dest="config_file",
+        help="Override default config file location",
+    )
+
+    return parser
 
 
 def main(event, context):
-    args = parser.parse_args()
+    # Lambda invocations carry no CLI args, so skip argparse entirely there
+    args = Args() if context else get_parser().parse_args()
     attributes = event.get("attributes", {})
 
     market_name = attributes.get("market_name", args.market_name)
@@ -120,149 +542,128 @@ def main(event, context):
     args.config_file = config_file
     args.job_mode = job_mode
 
-    print(f"{get_timestamp()}: STARTED: {args}")
+    logger.info("STARTED: %s", args)
 
     sandbox_mode = args.sandbox_mode
     job_mode = args.job_mode
     warn_after = args.warn_after
 
     if not sandbox_mode and not job_mode:
-        if sys.version_info[0] < 3:
-            # python2.x compatibility
-            response = raw_input("Production purchase! Confirm [Y]: ")  # noqa: F821
-        else:
-            response = input("Production purchase! Confirm [Y]: ")
+        response = input("Production purchase! Confirm [Y]: ")
         if response != "Y":
-            print("Exiting without submitting purchase.")
+            logger.info("Exiting without submitting purchase.")
             exit()
 
-    # Read settings
-    print(f"Reading config file: {config_file}")
-    config = configparser.ConfigParser()
-    config.read(config_file)
-    config_section = "production" 
-    
-    key = config.get(config_section, "API_KEY")
-    secret = config.get(config_section, "SECRET_KEY")
-    sns_topic = config.get(config_section, "SNS_TOPIC")
-
-    # Prep boto SNS client for email notifications
-    sns = boto3.client('sns')
-
-    # Instantiate public and auth API clients
-    client = RESTClient(api_key=key, api_secret=secret, timeout=5)
-
-    # Get product info
-    product = client.get_product(market_name)
+    # Read settings and set up the API clients
+    sns, sns_topic, client, product = asyncio.run(_bootstrap(config_file, market_name))
     
     # Get product info and setup quote and base currency
-    base_currency = product.base_currency_id
-    quote_currency = product.quote_currency_id
-    base_min_size = Decimal(product.base_min_size).normalize()
-    base_increment = Decimal(product.base_increment).normalize()
-    quote_increment = Decimal(product.quote_increment).normalize()
-    if amount_currency == product.quote_currency_id:
+    base_currency = product["base_currency_id"]
+    quote_currency = product["quote_currency_id"]
+    base_min_size = Decimal(product["base_min_size"])
+    base_increment = Decimal(product["base_increment"])
+    quote_increment = Decimal(product["quote_increment"])
+    if amount_currency == quote_currency:
         amount_currency_is_quote_currency = True
-    elif amount_currency == product.base_currency_id:
+    elif amount_currency == base_currency:
         amount_currency_is_quote_currency = False
     else:
         raise Exception(
             f"amount_currency {amount_currency} not in market {market_name}"
         )
     
-    print(f"product: {product}")
-    print(f"base_min_size: {base_min_size}")
-    print(f"quote_increment: {quote_increment}")
+    logger.info("product: %s", product)
+    logger.info("base_min_size: %s", base_min_size)
+    logger.info("quote_increment: %s", quote_increment)
  
     quote_size = str(amount.quantize(base_increment))
-    print(f"quote_size: {quote_size}")
-    print(f"order_side: {order_side}")
+    logger.info("quote_size: %s", quote_size)
+    logger.info("order_side: %s", order_side)
     # Put a buy order in
     if order_side == "BUY":
         order = client.market_order_buy(client_order_id=generate_client_order_id(), product_id=market_name, quote_size=quote_size)
-        print(dumps(order.to_dict(), indent=2))
+        od = order.to_dict()
+        logger.info("Order response: %s", od)
     else: # Currently only supports buy orders
         exit()
     
-    if "message" in order.to_dict():
+    if "message" in od:
     #     # Something went wrong if there's a 'message' field in response
-        sns.publish(
-            TopicArn=sns_topic,
-            Subject=f"Could not place {market_name} {order_side} order",
-            Message=json.dumps(order.to_dict(), sort_keys=True, indent=4)
+        queue_notification(
+            f"Could not place {market_name} {order_side} order",
+            _dump(od)
         )
+        flush_notifications(sns, sns_topic)
         exit()
 
-    if order and "error_response" in order.to_dict():
-        print(f"{get_timestamp()}: {market_name} Order Error")
+    if order and "error_response" in od:
+        logger.error("%s Order Error", market_name)
 
     # Get Order details to check status
-    order_id = order["success_response"]["order_id"]
-    client_order_id = order["success_response"]["client_order_id"]
-    print(f"order_id: {order_id}")
-    print(f"client_order_id: {client_order_id}")
-
-    # Check if the order is still open or unfilled
-    wait_time = 5
-    total_wait_time = 0
-
-    # Allow time for the order to be processed
-    time.sleep(wait_time)
-
-    order_response = client.get_order(order_id)
-    print(f"Response: {order_response}")
+    order_id = od["success_response"]["order_id"]
+    client_order_id = od["success_response"]["client_order_id"]
+    logger.info("order_id: %s", order_id)
+    logger.info("client_order_id: %s", client_order_id)
+
+    # Market orders often fill inline with their creation; only poll when the
+    # create response doesn't already carry a terminal status and fill price
+    success_response = od["success_response"]
+    if success_response.get("status") in FILLED_STATUSES and \
+            success_response.get("average_filled_price"):
+        order_details = success_response
+    else:
+        # Check if the order is still open or unfilled, backing off exponentially
+        # between polls
+        max_poll = args.max_poll or warn_after / 2
+        orders = asyncio.run(
+            wait_for_orders(client, [order_id], args.initial_poll, max_poll, warn_after)
+        )
+        order = orders[order_id]
 
-    order = order_response.order
-    print(f'Order: {order}')
-    print(f"Status: {order['status']}")
-    
-   
-    while order['status'] in ['OPEN', 'PENDING', 'UNKNOWN_ORDER_STATUS']:
-
-        if total_wait_time > warn_after:
-            sns.publish(
-                TopicArn=sns_topic,
-                Subject=f"{market_name} {order_side} order of {amount} {amount_currency} OPEN/UNFILLED",
-                Message=json.dumps(order.to_dict(), sort_keys=True, indent=4)
+        if is_cancelled(order):
+            # Most likely the order was manually cancelled in the UI
+            queue_notification(
+                f"{market_name} {order_side} order of {amount} {amount_currency} "
+                "CANCELLED/REJECTED",
+                _dump(order.to_dict())
             )
+            flush_notifications(sns, sns_topic)
             exit()
 
-        print(
-            f"{get_timestamp()}: Order {order_id} still {order['status']}. Sleeping for {wait_time} (total {total_wait_time})"
-        )
-        time.sleep(wait_time)
-        total_wait_time += wait_time
-        order_response = client.get_order(order_id)
-        order = order_response.order
-        
-        if (order["cancel_message"] or  order["reject_message"]) and \
-                (order["status"] not in ['OPEN', 'FILLED', 'UNKNOWN_ORDER_STATUS']):
-            # Most likely the order was manually cancelled in the UI
-
-            sns.publish(
-                TopicArn=sns_topic,
-                Subject=f"{market_name} {order_side} order of {amount} {amount_currency} CANCELLED/REJECTED",
-                Message=json.dumps(order.to_dict(), sort_keys=True, indent=4)
+        if order['status'] in PENDING_STATUSES:
+            queue_notification(
+                f"{market_name} {order_side} order of {amount} {amount_currency} "
+                "OPEN/UNFILLED",
+                _dump(order.to_dict())
             )
+            flush_notifications(sns, sns_topic)
             exit()
-    
+        order_details = order
+
     # Order status is no longer pending!
-    print('Printing the order')
-    print(f"order: {order}")
-    print(order)
-    
+    logger.info("order: %s", order_details)
 
-    market_price = Decimal(order.average_filled_price).quantize(quote_increment)
+    market_price = Decimal(order_details["average_filled_price"]).quantize(
+        quote_increment
+    )
 
-    subject = f"{market_name} {order_side} order of {amount} {amount_currency} {order['status']} @ {market_price} {quote_currency}"
-    print(subject)
-    sns.publish(
-        TopicArn=sns_topic,
-        Subject=subject,
-        Message=json.dumps(order.to_dict(), sort_keys=True, indent=4)
+    subject = (
+        f"{market_name} {order_side} order of {amount} {amount_currency} "
+        f"{order_details['status']} @ {market_price} {quote_currency}"
+    )
+    logger.info(subject)
+    queue_notification(
+        subject,
+        # Only the full order is needed when debugging a failure; keep the
+        # success notification to the fields the user actually reads
+        _dump({
+            "order_id": order_id,
+            "status": order_details["status"],
+            "average_filled_price": str(order_details["average_filled_price"]),
+        })
     )
+    flush_notifications(sns, sns_topic)
 
-    
     return {
         'statusCode': 200,
         'body': json.dumps("BTCBOT Job Ended!")
@@ -282,5 +683,6 @@ if __name__ == "__main__":
     #     }
     # }
 
+    logging.basicConfig(format="%(asctime)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
     main(event, context)
     
\ No newline at end of file